@@ -9,6 +9,7 @@ from src.solvers.vqe_solver import VQESolver
 from src.solvers.cvar_vqe_solver import CVaRVQESolver
 from src.solvers.qaoa_solver import QAOASolver
 from src.analysis.analyzer import analyze_solution
+from src.analysis.utils import qubo_to_ising_hamiltonian
 from src.analysis.plotter import plot_convergence, plot_solution_comparison
 
 def main(args):
@@ -18,18 +19,24 @@ def main(args):
     print(f"Problem Size: {args.num_securities} securities, Max Bonds N={int(args.num_securities/2)}\n")
 
     params = define_problem_parameters(args.num_securities)
-    qubo, offset, var_list, compiled_model = build_qubo_model(params)
+    model = build_qubo_model(params)
 
     solvers = {
         "classical": ClassicalSolver(),
-        "vqe": VQESolver(max_iter=150),
-        "cvar": CVaRVQESolver(alpha=args.cvar_alpha, max_iter=150),
-        "qaoa": QAOASolver(layers=args.qaoa_layers, max_iter=100)
+        "vqe": VQESolver(max_iter=150, restarts=args.restarts),
+        "cvar": CVaRVQESolver(alpha=args.cvar_alpha, max_iter=150, restarts=args.restarts),
+        "qaoa": QAOASolver(layers=args.qaoa_layers, max_iter=100, restarts=args.restarts)
     }
 
     solvers_to_run = solvers.keys() if args.run_all else [args.solver]
     results: Dict[str, Dict] = {}
 
+    # Shared by all quantum solvers so the Ising decomposition runs only once
+    quantum_solvers = {"vqe", "cvar", "qaoa"}
+    hamiltonian_bundle = None
+    if quantum_solvers.intersection(solvers_to_run):
+        hamiltonian_bundle = qubo_to_ising_hamiltonian(model)
+
     # --- 2. Run Solvers ---
     for solver_name in solvers_to_run:
         solver = solvers[solver_name]
@@ -38,7 +45,7 @@ def main(args):
         print("="*50)
 
         start_time = time.time()
-        solution_dict, history = solver.solve(qubo, offset, var_list)
+        solution_dict, history = solver.solve(model, hamiltonian_bundle)
         end_time = time.time()
 
         results[solver_name] = {
@@ -55,7 +62,7 @@ def main(args):
     for solver_name, result in results.items():
         print(f"\n--- {solver_name.upper()} RESULTS ---")
         metrics = analyze_solution(
-            result["solution"], params, compiled_model, result["runtime"]
+            result["solution"], params, result["runtime"]
         )
         results[solver_name]["metrics"] = metrics
 
@@ -83,6 +90,7 @@ if __name__ == "__main__":
     parser.add_argument("--solver", type=str, default="classical", choices=["classical", "vqe", "cvar", "qaoa"], help="Select the solver to run.")
     parser.add_argument("--cvar-alpha", type=float, default=0.2, help="Alpha parameter for CVaR-VQE (fraction of worst cases to average).")
     parser.add_argument("--qaoa-layers", type=int, default=2, help="Number of layers (p) for the QAOA algorithm.")
+    parser.add_argument("--restarts", type=int, default=1, help="Independent optimizer restarts per variational solver, run in parallel.")
     
     args = parser.parse_args()
     main(args)
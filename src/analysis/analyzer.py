@@ -1,14 +1,15 @@
 import time
+import numpy as np
 from typing import Dict, Any
 
-def analyze_solution(solution: Dict[str, int], params: Dict, compiled_model, runtime: float) -> Dict:
+def analyze_solution(solution: Dict[str, int], params: Dict, runtime: float) -> Dict:
     """Analyzes a solution vector and returns key metrics."""
     
-    # Evaluate expressions using the compiled model
-    decoded_solution = compiled_model.decode_sample(solution, vartype='BINARY')
+    # Evaluate the objective and constraint directly on the bond vector
+    y_vec = np.fromiter((solution[f'y[{c}]'] for c in params['C']), dtype=np.int8, count=len(params['C']))
     
-    num_bonds_selected = sum(v for k, v in solution.items() if k.startswith('y['))
-    constraint_violation = decoded_solution.constraints(only_broken=True)
+    num_bonds_selected = int(y_vec.sum())
+    constraint_violation = num_bonds_selected > params['N']
     
     print(f"Solver Runtime: {runtime:.2f} seconds")
     print(f"Number of bonds selected: {num_bonds_selected} (Constraint: <= {params['N']})")
@@ -16,9 +17,9 @@ def analyze_solution(solution: Dict[str, int], params: Dict, compiled_model, run
     if not constraint_violation:
         print("Constraint: Max bonds constraint SATISFIED.")
     else:
-        print(f"!! WARNING: CONSTRAINTS VIOLATED: {constraint_violation}")
+        print("!! WARNING: CONSTRAINTS VIOLATED: max_bonds")
 
-    obj_val = decoded_solution.energy
+    obj_val = float(y_vec @ (params['Q_matrix'] @ y_vec)) + params['objective_offset']
     print(f"Original Objective Function Value: {obj_val:.4f}")
     
     return {
@@ -2,16 +2,20 @@ import matplotlib.pyplot as plt
 import pandas as pd
 from typing import Dict, Any
 
+# A single figure is reused by every plot to avoid repeated backend setup
+_FIG, _AX = plt.subplots(figsize=(10, 6))
+
 def plot_convergence(history: Dict, title: str, save_path: str):
     """Plots the energy convergence from a history dictionary."""
-    plt.figure(figsize=(10, 6))
-    plt.plot(history['energies'], marker='o', linestyle='-')
-    plt.xlabel("Optimizer Iteration")
-    plt.ylabel("Energy / Cost")
-    plt.title(title)
-    plt.grid(True)
-    plt.savefig(save_path)
-    plt.close()
+    _AX.clear()
+    _FIG.set_size_inches(10, 6)
+    _AX.plot(history['energies'], marker='o', linestyle='-')
+    _AX.set_xlabel("Optimizer Iteration")
+    _AX.set_ylabel("Energy / Cost")
+    _AX.set_title(title)
+    _AX.grid(True)
+    _FIG.tight_layout()
+    _FIG.savefig(save_path)
     print(f"Convergence plot saved to {save_path}")
 
 def plot_solution_comparison(results: Dict[str, Dict], save_path: str):
@@ -20,11 +24,12 @@ def plot_solution_comparison(results: Dict[str, Dict], save_path: str):
         solver: res["metrics"] for solver, res in results.items()
     }).T
 
-    df['objective'].plot(kind='bar', figsize=(12, 7), color='skyblue')
-    plt.ylabel("Final Objective Value")
-    plt.title("Comparison of Final Objective Value by Solver")
-    plt.xticks(rotation=45, ha='right')
-    plt.tight_layout()
-    plt.savefig(save_path)
-    plt.close()
+    _AX.clear()
+    _FIG.set_size_inches(12, 7)
+    df['objective'].plot(kind='bar', ax=_AX, color='skyblue')
+    _AX.set_ylabel("Final Objective Value")
+    _AX.set_title("Comparison of Final Objective Value by Solver")
+    plt.setp(_AX.get_xticklabels(), rotation=45, ha='right')
+    _FIG.tight_layout()
+    _FIG.savefig(save_path)
     print(f"Comparison plot saved to {save_path}")
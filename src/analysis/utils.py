@@ -1,24 +1,68 @@
 import cirq
 import numpy as np
-from typing import Dict, List, Tuple
+from typing import Dict, List, NamedTuple, Tuple
 
-def qubo_to_ising_hamiltonian(
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+class QuboBundle(NamedTuple):
+    """A QUBO together with its integer-indexed array form.
+
+    The (i_idx, j_idx, coeffs) arrays hold one upper-triangular entry
+    (i <= j) per QUBO term, indexed by position in var_list, so that
+    downstream consumers never need to look variable names up by string.
+    """
+    qubo: Dict[Tuple[str, str], float]
+    i_idx: np.ndarray
+    j_idx: np.ndarray
+    coeffs: np.ndarray
+    var_list: List[str]
+    var_map: Dict[str, int]
+    offset: float
+
+
+def make_qubo_bundle(
     qubo: Dict[Tuple[str, str], float],
     offset: float,
     var_list: List[str]
+) -> QuboBundle:
+    """
+    Converts a QUBO dictionary into a QuboBundle.
+
+    Args:
+        qubo: The QUBO problem dictionary.
+        offset: The constant energy offset.
+        var_list: The ordered list of variable names.
+
+    Returns:
+        The QuboBundle holding both the dictionary and the array form.
+    """
+    var_map = {var_name: i for i, var_name in enumerate(var_list)}
+    idx_a = np.array([var_map[k[0]] for k in qubo], dtype=np.int32)
+    idx_b = np.array([var_map[k[1]] for k in qubo], dtype=np.int32)
+    coeffs = np.fromiter(qubo.values(), dtype=np.float64, count=len(qubo))
+    return QuboBundle(
+        qubo, np.minimum(idx_a, idx_b), np.maximum(idx_a, idx_b), coeffs,
+        list(var_list), var_map, float(offset)
+    )
+
+
+def qubo_to_ising_hamiltonian(
+    model: QuboBundle
 ) -> Tuple[cirq.PauliSum, float, List[cirq.GridQubit]]:
     """
-    Converts a QUBO dictionary to a Cirq Ising Hamiltonian.
+    Converts a QUBO to a Cirq Ising Hamiltonian.
 
     The conversion uses the identity x = (1 - Z) / 2, where x is a binary
     variable (0, 1) and Z is a Pauli Z operator with eigenvalues (+1, -1).
 
     Args:
-        qubo: The QUBO problem, formatted as a dictionary mapping variable
-              tuples to their quadratic coefficients.
-        offset: The constant energy offset in the QUBO formulation.
-        var_list: An ordered list of variable names. The order determines
-                  the mapping from variables to qubits.
+        model: The QUBO problem. The order of its var_list determines the
+               mapping from variables to qubits.
 
     Returns:
         A tuple containing:
@@ -26,79 +70,191 @@ def qubo_to_ising_hamiltonian(
         - The new constant energy offset for the Ising model.
         - A list of Cirq qubits corresponding to the variables.
     """
-    num_vars = len(var_list)
+    num_vars = len(model.var_list)
     qubits = cirq.GridQubit.rect(1, num_vars)
-    var_map = {var_name: i for i, var_name in enumerate(var_list)}
+    idx_i, idx_j, coeffs = model.i_idx, model.j_idx, model.coeffs
+    diag = idx_i == idx_j
 
     # Initialize Ising model parameters
     linear_coeffs = np.zeros(num_vars)      # h_i for Z_i terms
     quadratic_coeffs = np.zeros((num_vars, num_vars)) # J_ij for Z_i Z_j terms
-    ising_offset = offset
-
-    # Decompose QUBO coefficients into linear and quadratic parts
-    for (i_str, j_str), coeff in qubo.items():
-        i, j = var_map[i_str], var_map[j_str]
-        if i == j:
-            # This is a linear QUBO term: Q_ii * x_i
-            # x_i -> (1 - Z_i) / 2
-            # Q_ii * x_i -> Q_ii * (1 - Z_i) / 2 = Q_ii/2 - (Q_ii/2) * Z_i
-            ising_offset += coeff / 2.0
-            linear_coeffs[i] -= coeff / 2.0
-        else:
-            # This is a quadratic QUBO term: Q_ij * x_i * x_j
-            # x_i * x_j -> (1 - Z_i)/2 * (1 - Z_j)/2 = (1 - Z_i - Z_j + Z_i*Z_j)/4
-            # Q_ij * x_i*x_j -> Q_ij/4 * (1 - Z_i - Z_j + Z_i*Z_j)
-            ising_offset += coeff / 4.0
-            linear_coeffs[i] -= coeff / 4.0
-            linear_coeffs[j] -= coeff / 4.0
-            quadratic_coeffs[i, j] += coeff / 4.0
-
-    # Build the PauliSum from the Ising coefficients
-    hamiltonian_terms = []
-
-    # Add linear (h_i * Z_i) terms
-    for i in range(num_vars):
-        if not np.isclose(linear_coeffs[i], 0):
-            hamiltonian_terms.append(linear_coeffs[i] * cirq.Z(qubits[i]))
-
-    # Add quadratic (J_ij * Z_i * Z_j) terms
-    for i in range(num_vars):
-        for j in range(i + 1, num_vars):
-            if not np.isclose(quadratic_coeffs[i, j], 0):
-                hamiltonian_terms.append(quadratic_coeffs[i, j] * cirq.Z(qubits[i]) * cirq.Z(qubits[j]))
+
+    # Linear QUBO terms: Q_ii * x_i -> Q_ii/2 - (Q_ii/2) * Z_i
+    np.add.at(linear_coeffs, idx_i[diag], -coeffs[diag] / 2.0)
+
+    # Quadratic QUBO terms: Q_ij * x_i*x_j -> Q_ij/4 * (1 - Z_i - Z_j + Z_i*Z_j)
+    quad = coeffs[~diag] / 4.0
+    np.add.at(linear_coeffs, idx_i[~diag], -quad)
+    np.add.at(linear_coeffs, idx_j[~diag], -quad)
+    np.add.at(quadratic_coeffs, (idx_i[~diag], idx_j[~diag]), quad)
+
+    ising_offset = model.offset + float(coeffs[diag].sum() / 2.0 + quad.sum())
+
+    # Build the PauliSum from the nonzero Ising coefficients
+    hamiltonian_terms = [
+        linear_coeffs[i] * cirq.Z(qubits[i])
+        for i in np.flatnonzero(np.abs(linear_coeffs) > 1e-12)
+    ]
+    nz = np.argwhere(np.triu(np.abs(quadratic_coeffs) > 1e-12, k=1))
+    hamiltonian_terms.extend(
+        quadratic_coeffs[i, j] * cirq.Z(qubits[i]) * cirq.Z(qubits[j])
+        for i, j in nz
+    )
 
     return cirq.PauliSum.from_pauli_strings(hamiltonian_terms), ising_offset, qubits
 
 
-def get_bitstring_energy(
-    bitstring_int: int,
-    qubo: Dict[Tuple[str, str], float],
-    offset: float,
-    var_list: List[str]
-) -> float:
+def get_bitstring_energy(bitstring_int: int, model: QuboBundle) -> float:
     """
     Calculates the energy of a specific bitstring outcome for a given QUBO.
 
-    This is used by the CVaR-VQE solver to evaluate the cost of individual
-    measurement samples.
-
     Args:
         bitstring_int: The integer representation of the measurement outcome
                        (as returned by Cirq).
-        qubo: The QUBO problem dictionary.
-        offset: The constant energy offset.
-        var_list: The ordered list of variable names.
+        model: The QUBO problem.
 
     Returns:
         The classical energy of the given bitstring according to the QUBO.
     """
-    num_vars = len(var_list)
-    # Convert integer to a padded binary string, then to a solution dictionary
-    binary_string = f"{bitstring_int:0{num_vars}b}"
-    solution = {var: int(bit) for var, bit in zip(var_list, binary_string)}
-    
-    energy = offset
-    for (i_str, j_str), coeff in qubo.items():
-        energy += coeff * solution[i_str] * solution[j_str]
-        
-    return energy
+    num_vars = len(model.var_list)
+    bits = (bitstring_int >> (num_vars - 1 - np.arange(num_vars))) & 1
+    return model.offset + float(np.sum(model.coeffs * bits[model.i_idx] * bits[model.j_idx]))
+
+
+def qubo_to_matrix(model: QuboBundle, dtype=np.float64) -> np.ndarray:
+    """
+    Converts a QUBO to a dense upper-triangular coefficient matrix.
+
+    The energy of a binary vector x is then given by x^T Q x + offset, which
+    allows a whole batch of samples to be evaluated with a single einsum.
+
+    Args:
+        model: The QUBO problem. The order of its var_list determines the
+               row/column index of each variable in the matrix.
+        dtype: The floating point type of the returned matrix.
+
+    Returns:
+        A (num_vars, num_vars) upper-triangular ndarray of QUBO coefficients.
+    """
+    num_vars = len(model.var_list)
+    Q = np.zeros((num_vars, num_vars), dtype=dtype)
+    np.add.at(Q, (model.i_idx, model.j_idx), model.coeffs)
+    return Q
+
+
+# Bitstrings enumerated per block by the NumPy fallback
+ENUMERATION_BLOCK = 1 << 16
+
+
+def all_bitstring_energies(Q: np.ndarray, offset: float) -> np.ndarray:
+    """
+    Evaluates the QUBO energy of every one of the 2^n bitstrings.
+
+    Bitstring x is ordered big-endian, matching Cirq's state vector and
+    measurement conventions, so entry x of the result is the diagonal of the
+    corresponding Ising Hamiltonian (plus offset).
+
+    Args:
+        Q: The (n, n) QUBO matrix as returned by qubo_to_matrix.
+        offset: The constant energy offset.
+
+    Returns:
+        A length 2^n array of classical energies.
+    """
+    num_vars = Q.shape[0]
+    total = 2**num_vars
+    shifts = np.arange(num_vars - 1, -1, -1)
+    energies = np.empty(total, dtype=Q.dtype)
+    # Bits are materialised a fixed-size block at a time, so memory beyond
+    # the result stays O(block * n) instead of O(2^n * n)
+    for start in range(0, total, ENUMERATION_BLOCK):
+        x = np.arange(start, min(start + ENUMERATION_BLOCK, total))
+        X = ((x[:, None] >> shifts) & 1).astype(Q.dtype)
+        energies[start:start + len(x)] = offset + np.einsum('bi,ij,bj->b', X, Q, X, optimize=True)
+    return energies
+
+
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, cache=True)
+    def _gray_code_energies_kernel(n, diag, W, offset):
+        # Walk the bitstrings in Gray-code order, where each step flips one
+        # bit k (the trailing zero count of the step index) and so changes
+        # the energy by +/-(diag[v] + W[v] . x) in O(n). The walk is split
+        # into chunks, each seeded with one direct O(n^2) evaluation, so the
+        # chunks can run in parallel and rounding drift stays bounded.
+        total = 1 << n
+        chunk = min(total, 1 << 12)
+        out = np.empty(total)
+        for c in prange(total // chunk):
+            start = c * chunk
+            g = start ^ (start >> 1)
+            bits = np.empty(n)
+            for v in range(n):
+                bits[v] = (g >> (n - 1 - v)) & 1
+            e = offset
+            for v in range(n):
+                if bits[v]:
+                    e += diag[v]
+                    for w in range(v + 1, n):
+                        e += W[v, w] * bits[w]
+            out[g] = e
+            for i in range(start + 1, start + chunk):
+                k = 0
+                while not (i >> k) & 1:
+                    k += 1
+                v = n - 1 - k
+                delta = diag[v]
+                for w in range(n):
+                    delta += W[v, w] * bits[w]
+                if bits[v]:
+                    e -= delta
+                    bits[v] = 0
+                else:
+                    e += delta
+                    bits[v] = 1
+                g ^= 1 << k
+                out[g] = e
+        return out
+
+
+def compute_all_energies(model: QuboBundle) -> np.ndarray:
+    """
+    Evaluates the QUBO energy of all 2^n bitstrings from its array form.
+
+    Uses a parallel Numba Gray-code walk (O(n) work per bitstring) when Numba
+    is installed, and falls back to the NumPy matrix enumeration in
+    all_bitstring_energies otherwise.
+
+    Args:
+        model: The QUBO problem.
+
+    Returns:
+        A length 2^n array of classical energies, big-endian ordered.
+    """
+    Q = qubo_to_matrix(model)
+    if NUMBA_AVAILABLE:
+        diag = np.diag(Q).copy()
+        W = Q + Q.T - 2 * np.diag(diag)  # symmetric couplings, zero diagonal
+        return _gray_code_energies_kernel(len(model.var_list), diag, W, model.offset)
+    return all_bitstring_energies(Q, model.offset)
+
+
+def parameter_shift_gradient(fn, params: np.ndarray) -> np.ndarray:
+    """
+    Computes the exact gradient of an expectation value with the parameter-shift rule.
+
+    Valid when every parameter enters the circuit as a single rotation
+    exp(-i theta P / 2), as in the hardware-efficient VQE ansatz. Each
+    component is (fn(p + pi/2 e_k) - fn(p - pi/2 e_k)) / 2.
+
+    Args:
+        fn: The expectation value as a function of the circuit parameters.
+        params: The point at which to evaluate the gradient.
+
+    Returns:
+        The gradient as an array with the same shape as params.
+    """
+    shifts = (np.pi / 2) * np.eye(len(params))
+    forward = np.array([fn(params + d) for d in shifts])
+    backward = np.array([fn(params - d) for d in shifts])
+    return (forward - backward) / 2.0
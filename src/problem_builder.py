@@ -1,56 +1,78 @@
 import numpy as np
-from pyqubo import Array, Constraint, Placeholder, CompileInfo
 from typing import Tuple, List, Dict, Any
+from .analysis.utils import QuboBundle
 
 def define_problem_parameters(num_securities: int) -> Dict[str, Any]:
     """Generates a sample problem instance with random but plausible data."""
-    np.random.seed(42)
+    rng = np.random.default_rng(42)
     params = {}
     params['C'] = list(range(num_securities))
-    params['p_c'] = np.random.uniform(90, 110, num_securities)
-    params['m_c'] = np.random.uniform(1, 5, num_securities)
-    params['M_c'] = params['m_c'] + np.random.uniform(10, 20, num_securities)
-    params['i_c'] = np.random.uniform(5, 15, num_securities)
-    params['delta_c'] = np.ones(num_securities)
+    params['p_c'] = rng.uniform(90, 110, num_securities).astype(np.float32)
+    params['m_c'] = rng.uniform(1, 5, num_securities).astype(np.float32)
+    params['M_c'] = (params['m_c'] + rng.uniform(10, 20, num_securities)).astype(np.float32)
+    params['i_c'] = rng.uniform(5, 15, num_securities).astype(np.float32)
+    params['delta_c'] = np.ones(num_securities, dtype=np.float32)
     params['L'] = [0]
     params['J'] = [0]
     params['K_l'] = {0: params['C']}
-    params['beta_c_j'] = np.random.uniform(-0.5, 1.5, (num_securities, 1))
-    params['K_target_l_j'] = np.random.uniform(5, 10, (1, 1))
-    params['rho_j'] = np.array([1.0])
+    params['beta_c_j'] = rng.uniform(-0.5, 1.5, (num_securities, 1)).astype(np.float32)
+    params['K_target_l_j'] = rng.uniform(5, 10, (1, 1)).astype(np.float32)
+    params['rho_j'] = np.array([1.0], dtype=np.float32)
     params['N'] = int(num_securities / 2)
     params['A_c'] = (params['m_c'] + np.minimum(params['M_c'], params['i_c'])) / (2 * params['delta_c'])
     return params
 
-def build_qubo_model(params: Dict[str, Any]) -> Tuple[Dict, float, List[str], CompileInfo]:
+def _squared_linear_form(a: np.ndarray, target: float) -> Tuple[np.ndarray, float]:
+    """Expands (a . x - target)^2 over binaries into an upper-triangular QUBO and constant."""
+    Q = 2 * np.triu(np.outer(a, a), k=1)
+    np.fill_diagonal(Q, a * a - 2 * target * a)  # x^2 = x for binaries
+    return Q, target**2
+
+def _slack_coefficients(N: int) -> List[int]:
+    """Bounded binary slack weights 1, 2, ..., 2^(k-1), N - (2^k - 1), whose subset sums span exactly 0..N."""
+    k = N.bit_length() - 1
+    return [2**i for i in range(k)] + ([N - (2**k - 1)] if N > 0 else [])
+
+def build_qubo_model(params: Dict[str, Any]) -> QuboBundle:
     """Builds the QUBO model from the problem parameters."""
     num_securities = len(params['C'])
     N = params['N']
-    y = Array.create('y', shape=num_securities, vartype='BINARY')
+    slack_coeffs = _slack_coefficients(N)
+    num_slack_bits = len(slack_coeffs)
+    var_list = [f'y[{c}]' for c in params['C']] + [f's[{i}]' for i in range(num_slack_bits)]
+    num_vars = len(var_list)
 
-    # Objective Function
-    H_obj = 0
+    # Objective Function: sum_{l,j} rho_j * (sum_{c in K_l} beta_cj * A_c * y_c - target_lj)^2
+    Q_obj = np.zeros((num_vars, num_vars))
+    obj_offset = 0.0
     for l in params['L']:
         for j in params['J']:
-            inner_sum = sum(params['beta_c_j'][c, j] * params['A_c'][c] * y[c] for c in params['K_l'][l])
-            target = params['K_target_l_j'][l, j]
-            H_obj += params['rho_j'][j] * (inner_sum - target)**2
-
-    # Constraint: sum(y_c) <= N
-    num_slack_bits = (N).bit_length()
-    s = Array.create('s', shape=num_slack_bits, vartype='BINARY')
-    slack_expression = sum(2**k * s[k] for k in range(num_slack_bits))
-    P = Placeholder('P')
-    H_constraint = Constraint((sum(y) + slack_expression - N)**2, label="max_bonds")
+            a = np.zeros(num_vars)
+            K = list(params['K_l'][l])
+            a[K] = params['beta_c_j'][K, j] * params['A_c'][K]
+            Q_term, const = _squared_linear_form(a, float(params['K_target_l_j'][l, j]))
+            Q_obj += params['rho_j'][j] * Q_term
+            obj_offset += float(params['rho_j'][j]) * const
 
-    # Final Hamiltonian and Model Compilation
-    H = H_obj + P * H_constraint
-    model = H.compile()
+    # Constraint: sum(y_c) <= N, as (sum(y_c) + sum_k w_k s_k - N)^2
+    b = np.concatenate([np.ones(num_securities), np.array(slack_coeffs, dtype=float)])
+    Q_constraint, constraint_offset = _squared_linear_form(b, N)
 
     # Heuristic for penalty value
-    penalty_value = 2 * np.max(np.abs(model.to_qubo(feed_dict={'P': 0})[0].values()))
-    
-    qubo, offset = model.to_qubo(feed_dict={'P': penalty_value})
-    print(f"QUBO built with {len(model.variables)} variables. Penalty P={penalty_value:.2f}")
-    
-    return qubo, offset, model.variables, model
+    penalty_value = 2 * np.max(np.abs(Q_obj))
+
+    Q = Q_obj + penalty_value * Q_constraint
+    offset = float(obj_offset + penalty_value * constraint_offset)
+    rows, cols = np.nonzero(Q)
+    qubo = {(var_list[i], var_list[j]): float(Q[i, j]) for i, j in zip(rows, cols)}
+    print(f"QUBO built with {num_vars} variables. Penalty P={penalty_value:.2f}")
+
+    # Objective-only QUBO over the bond variables, used to score solutions
+    params['Q_matrix'] = Q_obj[:num_securities, :num_securities]
+    params['objective_offset'] = float(obj_offset)
+
+    var_map = {var_name: i for i, var_name in enumerate(var_list)}
+    return QuboBundle(
+        qubo, rows.astype(np.int32), cols.astype(np.int32), Q[rows, cols],
+        var_list, var_map, offset
+    )
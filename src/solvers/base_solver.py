@@ -1,18 +1,56 @@
+import multiprocessing
+import os
+import cirq
+import numpy as np
 from abc import ABC, abstractmethod
-from typing import Dict, Tuple, List, Any
+from typing import Dict, Tuple, List, Any, Optional, Callable
+from ..analysis.utils import QuboBundle
+
+# One state-vector simulator shared by all variational solvers
+SHARED_SIMULATOR = cirq.Simulator(dtype=np.complex64, seed=42)
+
+def _available_cpus() -> int:
+    """Number of CPUs this process may run on, honouring its affinity mask."""
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+def run_restarts(one_restart: Callable[[int], Any], num_restarts: int, parallel: bool = True) -> List[Any]:
+    """
+    Runs one_restart(seed) for seeds 0..num_restarts-1 and returns the outcomes.
+
+    When parallel is set and more than one worker would be used, restarts are
+    spread over a multiprocessing.Pool on a forkserver (or spawn) context, so
+    workers never inherit this process's threads; one_restart must then be
+    picklable, i.e. a module-level function or a functools.partial of one.
+    Otherwise the restarts run serially in this process.
+    """
+    num_workers = min(num_restarts, _available_cpus())
+    if not parallel or num_workers <= 1:
+        return [one_restart(seed) for seed in range(num_restarts)]
+
+    start_method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+    with multiprocessing.get_context(start_method).Pool(num_workers) as pool:
+        return pool.map(one_restart, range(num_restarts))
+
+def best_restart(outcomes: List[Tuple[float, np.ndarray, Dict]]) -> Tuple[float, np.ndarray, Dict]:
+    """Returns the (fun, params, history) restart outcome with the lowest fun."""
+    return min(outcomes, key=lambda outcome: outcome[0])
 
 class BaseSolver(ABC):
     """Abstract base class for all solvers."""
 
     @abstractmethod
-    def solve(self, qubo: Dict, offset: float, var_list: List[str]) -> Tuple[Dict[str, int], Dict[str, Any]]:
+    def solve(self, model: QuboBundle, hamiltonian_bundle: Optional[Tuple] = None) -> Tuple[Dict[str, int], Dict[str, Any]]:
         """
         Solves the given QUBO problem.
 
         Args:
-            qubo (Dict): The QUBO dictionary.
-            offset (float): The energy offset.
-            var_list (List[str]): The list of variable names.
+            model (QuboBundle): The QUBO problem, with its variable names,
+                offset and integer-indexed coefficient arrays.
+            hamiltonian_bundle (Optional[Tuple]): A precomputed result of
+                qubo_to_ising_hamiltonian for this QUBO. Quantum solvers use
+                it instead of recomputing the Ising decomposition.
 
         Returns:
             A tuple containing:
@@ -1,12 +1,31 @@
-from typing import Dict, Tuple, List, Any
+from typing import Dict, Tuple, Any, Optional
 from dwave.samplers import SimulatedAnnealingSampler
 from .base_solver import BaseSolver
+from ..analysis.utils import QuboBundle, compute_all_energies
+
+# Largest problem solved by exhaustive enumeration instead of annealing
+BRUTE_FORCE_MAX_VARS = 20
 
 class ClassicalSolver(BaseSolver):
-    """Solves the QUBO using a classical simulated annealer for benchmarking."""
-    def solve(self, qubo: Dict, offset: float, var_list: List[str]) -> Tuple[Dict[str, int], Dict[str, Any]]:
-        sampler = SimulatedAnnealingSampler()
-        response = sampler.sample_qubo(qubo, num_reads=100)
+    """Solves the QUBO using a classical simulated annealer for benchmarking.
+
+    Small problems are enumerated exhaustively, which is both faster and
+    provably optimal.
+    """
+    def __init__(self):
+        self.sampler = SimulatedAnnealingSampler()
+
+    def solve(self, model: QuboBundle, hamiltonian_bundle: Optional[Tuple] = None) -> Tuple[Dict[str, int], Dict[str, Any]]:
+        num_vars = len(model.var_list)
+        if num_vars <= BRUTE_FORCE_MAX_VARS:
+            energies = compute_all_energies(model)
+            best = int(energies.argmin())
+            solution_bitstring = f"{best:0{num_vars}b}"
+            solution = {var: int(bit) for var, bit in zip(model.var_list, solution_bitstring)}
+            print(f"Classical solver (exhaustive) found solution with energy: {energies[best]:.4f}")
+            return solution, {}
+
+        response = self.sampler.sample_qubo(model.qubo, num_reads=100)
         solution = response.first.sample
-        print(f"Classical solver found solution with energy: {response.first.energy + offset:.4f}")
+        print(f"Classical solver found solution with energy: {response.first.energy + model.offset:.4f}")
         return solution, {}
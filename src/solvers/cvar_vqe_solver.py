@@ -1,63 +1,112 @@
 import cirq
 import numpy as np
+from functools import partial
 from scipy.optimize import minimize
-from typing import Dict, Tuple, List, Any
-from .base_solver import BaseSolver
-from ..analysis.utils import qubo_to_ising_hamiltonian, get_bitstring_energy
+from typing import Dict, Tuple, Any, Optional, List
+from .base_solver import BaseSolver, SHARED_SIMULATOR, best_restart, run_restarts
+from .vqe_solver import hardware_efficient_ansatz
+from ..analysis.utils import QuboBundle, qubo_to_ising_hamiltonian, qubo_to_matrix
+
+try:
+    import cupy as cp
+    CUPY_AVAILABLE = True
+except ImportError:
+    CUPY_AVAILABLE = False
+
+# Problem size from which sample energies are evaluated on the GPU
+CUPY_THRESHOLD = 20
+
+
+def _cvar_restart(
+    model: QuboBundle,
+    qubits: List[cirq.Qid],
+    alpha: float,
+    max_iter: int,
+    use_gpu: bool,
+    seed: int
+) -> Tuple[float, np.ndarray, Dict]:
+    """
+    One CVaR-VQE optimization from a seeded random start, returning (fun, params, history).
+
+    Module-level so that run_restarts can ship it to worker processes. The
+    initial parameters and every shot are drawn from a generator seeded here.
+    """
+    num_qubits = len(qubits)
+    Q = qubo_to_matrix(model, dtype=np.float32)
+    if use_gpu:
+        Q_gpu = cp.asarray(Q)
+
+    # Same ansatz as VQE, built once with symbolic parameters
+    param_circuit, symbols = hardware_efficient_ansatz(qubits)
+    simulator = SHARED_SIMULATOR
+    history = {"energies": [], "params": []}
+    rng = np.random.default_rng(seed)
+
+    def cvar_cost_function(params):
+        # 1. Simulate once and sample bitstrings from |psi|^2
+        resolver = cirq.ParamResolver(dict(zip(symbols, params)))
+        final_state = simulator.simulate(param_circuit, param_resolver=resolver).final_state_vector
+        probs = np.abs(final_state)**2
+        bitstrings = rng.choice(2**num_qubits, size=200, p=probs / probs.sum())
+        samples = (bitstrings[:, None] >> np.arange(num_qubits - 1, -1, -1)) & 1
+
+        # Number of worst cases averaged; at least one sample is always kept
+        k = max(1, int(alpha * len(samples)))
+        if use_gpu:
+            # Bits are copied to the device as int8, a quarter of the bytes,
+            # and only widened to float32 there for the matmul
+            X_gpu = cp.asarray(samples.astype(np.int8)).astype(cp.float32)
+            # 2. Calculate energy for each sample as a batched x^T Q x
+            energies = cp.einsum('bi,ij,bj->b', X_gpu, Q_gpu, X_gpu)
+            # 3. Select the worst cases (highest energies) and calculate CVaR;
+            #    partition is an O(R) selection and only the scalar comes back
+            cvar_energy = model.offset + float(cp.partition(energies, -k)[-k:].mean())
+        else:
+            X = samples.astype(np.float32)
+            # 2. Calculate energy for each sample as a batched x^T Q x
+            #    (a fixed-shape matmul is cheaper here than einsum's per-call path planning)
+            energies = model.offset + ((X @ Q) * X).sum(axis=1)
+            # 3. Select the worst cases (highest energies) and calculate CVaR
+            #    (partition is an O(R) selection)
+            cvar_energy = float(np.partition(energies, -k)[-k:].mean())
+
+        history["energies"].append(cvar_energy)
+        history["params"].append(params)
+        return cvar_energy
+
+    initial_params = rng.uniform(0, 2 * np.pi, 2 * num_qubits)
+    result = minimize(cvar_cost_function, initial_params, method='COBYLA', options={'maxiter': max_iter})
+    return result.fun, result.x, history
 
 
 class CVaRVQESolver(BaseSolver):
     """Solves with CVaR-VQE, optimizing for the average of the worst-case results."""
-    def __init__(self, alpha: float = 0.2, max_iter: int = 150):
+    def __init__(self, alpha: float = 0.2, max_iter: int = 150, restarts: int = 1):
         self.alpha = alpha
         self.max_iter = max_iter
+        self.restarts = restarts
 
-    def solve(self, qubo: Dict, offset: float, var_list: List[str]) -> Tuple[Dict[str, int], Dict[str, Any]]:
-        hamiltonian, ising_offset, qubits = qubo_to_ising_hamiltonian(qubo, offset, var_list)
+    def solve(self, model: QuboBundle, hamiltonian_bundle: Optional[Tuple] = None) -> Tuple[Dict[str, int], Dict[str, Any]]:
+        if hamiltonian_bundle is None:
+            hamiltonian_bundle = qubo_to_ising_hamiltonian(model)
+        hamiltonian, ising_offset, qubits = hamiltonian_bundle
         num_qubits = len(qubits)
+        use_gpu = CUPY_AVAILABLE and num_qubits >= CUPY_THRESHOLD
 
-        def ansatz(params):
-            # Same ansatz as VQE
-            circuit = cirq.Circuit()
-            for i in range(num_qubits):
-                circuit.append(cirq.Ry(rads=params[2*i])(qubits[i]))
-                circuit.append(cirq.Rz(rads=params[2*i+1])(qubits[i]))
-            for i in range(num_qubits - 1):
-                circuit.append(cirq.CZ(qubits[i], qubits[i+1]))
-            return circuit
-
-        simulator = cirq.Simulator()
-        history = {"energies": [], "params": []}
-        
-        def cvar_cost_function(params):
-            # 1. Sample from the circuit
-            circuit = ansatz(params)
-            circuit.append(cirq.measure(*qubits, key='result'))
-            samples = simulator.run(circuit, repetitions=200).measurements['result']
-            
-            # 2. Calculate energy for each sample
-            energies = [get_bitstring_energy(s, qubo, offset) for s in samples]
-            
-            # 3. Sort and calculate CVaR
-            energies.sort(reverse=True) # Sort descending to get worst cases
-            num_worst = int(self.alpha * len(energies))
-            cvar_energy = np.mean(energies[:num_worst])
-            
-            history["energies"].append(cvar_energy)
-            history["params"].append(params)
-            return cvar_energy
-
-        initial_params = np.random.uniform(0, 2 * np.pi, 2 * num_qubits)
-        result = minimize(cvar_cost_function, initial_params, method='COBYLA', options={'maxiter': self.max_iter})
+        one_restart = partial(_cvar_restart, model, qubits, self.alpha, self.max_iter, use_gpu)
+        # Restarts would contend for the one device, so GPU runs restart serially
+        outcomes = run_restarts(one_restart, self.restarts, parallel=not use_gpu)
+        _, best_params, history = best_restart(outcomes)
 
         # Final analysis is still based on the best single outcome found
-        final_circuit = ansatz(result.x)
-        final_circuit.append(cirq.measure(*qubits, key='result'))
-        samples = simulator.run(final_circuit, repetitions=1000)
+        param_circuit, symbols = hardware_efficient_ansatz(qubits)
+        measured_circuit = param_circuit + cirq.measure(*qubits, key='result')
+        resolver = cirq.ParamResolver(dict(zip(symbols, best_params)))
+        samples = SHARED_SIMULATOR.run(measured_circuit, param_resolver=resolver, repetitions=1000)
         counts = samples.histogram(key='result')
         most_common_outcome = counts.most_common(1)[0][0]
         solution_bitstring = f"{most_common_outcome:0{num_qubits}b}"
-        solution = {var: int(bit) for var, bit in zip(var_list, solution_bitstring)}
+        solution = {var: int(bit) for var, bit in zip(model.var_list, solution_bitstring)}
 
         print(f"CVaR-VQE found solution with CVaR energy: {min(history['energies']):.4f}")
         return solution, history
@@ -1,55 +1,95 @@
 import cirq
 import numpy as np
+import sympy
+from functools import partial
 from scipy.optimize import minimize
-from typing import Dict, Tuple, List, Any
-from .base_solver import BaseSolver
-from ..analysis.utils import qubo_to_ising_hamiltonian
+from typing import Dict, Tuple, Any, Optional, List
+from .base_solver import BaseSolver, SHARED_SIMULATOR, best_restart, run_restarts
+from ..analysis.utils import QuboBundle, qubo_to_ising_hamiltonian, compute_all_energies
+
+def _qaoa_ansatz(
+    problem_hamiltonian: cirq.PauliSum,
+    qubits: List[cirq.Qid],
+    layers: int
+) -> Tuple[cirq.Circuit, Tuple[sympy.Symbol, ...]]:
+    """Builds the p-layer QAOA circuit once, with symbolic gammas followed by betas."""
+    # Mixer Hamiltonian
+    mixer_hamiltonian = cirq.PauliSum.from_pauli_strings([cirq.X(q) for q in qubits])
+
+    gammas = sympy.symbols(f'gamma0:{layers}')
+    betas = sympy.symbols(f'beta0:{layers}')
+    param_circuit = cirq.Circuit(cirq.H.on_each(*qubits))
+    for i in range(layers):
+        # Problem Hamiltonian Evolution
+        param_circuit += cirq.PauliSumExponential(problem_hamiltonian, gammas[i])
+        # Mixer Hamiltonian Evolution
+        param_circuit += cirq.PauliSumExponential(mixer_hamiltonian, betas[i])
+    return param_circuit, gammas + betas
+
+def _qaoa_restart(
+    pauli_terms: List[cirq.PauliString],
+    qubits: List[cirq.Qid],
+    diag_energies: np.ndarray,
+    layers: int,
+    max_iter: int,
+    seed: int
+) -> Tuple[float, np.ndarray, Dict]:
+    """
+    One QAOA optimization from a seeded random start, returning (fun, params, history).
+
+    Module-level so that run_restarts can ship it to worker processes; the
+    Hamiltonian travels as its Pauli terms because a PauliSum cannot be pickled.
+    """
+    problem_hamiltonian = cirq.PauliSum.from_pauli_strings(pauli_terms)
+    param_circuit, symbols = _qaoa_ansatz(problem_hamiltonian, qubits, layers)
+    simulator = SHARED_SIMULATOR
+    history = {"energies": [], "params": []}
+
+    def cost_function(params):
+        resolver = cirq.ParamResolver(dict(zip(symbols, params)))
+        psi = simulator.simulate(param_circuit, param_resolver=resolver).final_state_vector
+        energy = float(np.abs(psi)**2 @ diag_energies)
+        history["energies"].append(energy)
+        history["params"].append(params)
+        return energy
+
+    rng = np.random.default_rng(seed)
+    initial_params = rng.uniform(0, np.pi, 2 * layers)
+    result = minimize(cost_function, initial_params, method='COBYLA', options={'maxiter': max_iter})
+    return result.fun, result.x, history
 
 class QAOASolver(BaseSolver):
     """Solves the problem using the Quantum Approximate Optimization Algorithm (QAOA)."""
-    def __init__(self, layers: int = 2, max_iter: int = 100):
+    def __init__(self, layers: int = 2, max_iter: int = 100, restarts: int = 1):
         self.p = layers # Number of QAOA layers
+        self.max_iter = max_iter
+        self.restarts = restarts
 
-    def solve(self, qubo: Dict, offset: float, var_list: List[str]) -> Tuple[Dict[str, int], Dict[str, Any]]:
-        problem_hamiltonian, ising_offset, qubits = qubo_to_ising_hamiltonian(qubo, offset, var_list)
+    def solve(self, model: QuboBundle, hamiltonian_bundle: Optional[Tuple] = None) -> Tuple[Dict[str, int], Dict[str, Any]]:
+        if hamiltonian_bundle is None:
+            hamiltonian_bundle = qubo_to_ising_hamiltonian(model)
+        problem_hamiltonian, _, qubits = hamiltonian_bundle
         num_qubits = len(qubits)
 
-        # Mixer Hamiltonian
-        mixer_hamiltonian = cirq.PauliSum.from_pauli_strings([cirq.X(q) for q in qubits])
-        
-        # QAOA Ansatz
-        def qaoa_ansatz(params):
-            gammas = params[:self.p]
-            betas = params[self.p:]
-            circuit = cirq.Circuit(cirq.H.on_each(*qubits))
-            for i in range(self.p):
-                # Problem Hamiltonian Evolution
-                circuit += cirq.PauliSumExponential(problem_hamiltonian, gammas[i])
-                # Mixer Hamiltonian Evolution
-                circuit += cirq.PauliSumExponential(mixer_hamiltonian, betas[i])
-            return circuit
-
-        simulator = cirq.Simulator()
-        history = {"energies": [], "params": []}
-
-        def cost_function(params):
-            circuit = qaoa_ansatz(params)
-            expectation = simulator.simulate_expectation_values(circuit, problem_hamiltonian)
-            energy = np.real(expectation[0])
-            history["energies"].append(energy + ising_offset)
-            history["params"].append(params)
-            return energy
-
-        initial_params = np.random.uniform(0, np.pi, 2 * self.p)
-        result = minimize(cost_function, initial_params, method='COBYLA', options={'maxiter': self.max_iter})
-
-        final_circuit = qaoa_ansatz(result.x)
-        final_circuit.append(cirq.measure(*qubits, key='result'))
-        samples = simulator.run(final_circuit, repetitions=1000)
+        # The problem Hamiltonian is diagonal in the Z basis, so its expectation
+        # is the classical energy spectrum weighted by |psi|^2
+        diag_energies = compute_all_energies(model)
+
+        one_restart = partial(
+            _qaoa_restart, list(problem_hamiltonian), qubits, diag_energies, self.p, self.max_iter
+        )
+        outcomes = run_restarts(one_restart, self.restarts)
+        _, best_params, history = best_restart(outcomes)
+
+        # QAOA Ansatz, measured at the best parameters found
+        param_circuit, symbols = _qaoa_ansatz(problem_hamiltonian, qubits, self.p)
+        measured_circuit = param_circuit + cirq.measure(*qubits, key='result')
+        resolver = cirq.ParamResolver(dict(zip(symbols, best_params)))
+        samples = SHARED_SIMULATOR.run(measured_circuit, param_resolver=resolver, repetitions=1000)
         counts = samples.histogram(key='result')
         most_common_outcome = counts.most_common(1)[0][0]
         solution_bitstring = f"{most_common_outcome:0{num_qubits}b}"
-        solution = {var: int(bit) for var, bit in zip(var_list, solution_bitstring)}
-        
+        solution = {var: int(bit) for var, bit in zip(model.var_list, solution_bitstring)}
+
         print(f"QAOA found solution with energy: {min(history['energies']):.4f}")
         return solution, history
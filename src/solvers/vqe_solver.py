@@ -1,50 +1,89 @@
 import cirq
 import numpy as np
+import sympy
+from functools import partial
 from scipy.optimize import minimize
-from typing import Dict, Tuple, List, Any
-from .base_solver import BaseSolver
-from ..analysis.utils import qubo_to_ising_hamiltonian # Helper function
+from typing import Dict, Tuple, Any, Optional, List
+from .base_solver import BaseSolver, SHARED_SIMULATOR, best_restart, run_restarts
+from ..analysis.utils import QuboBundle, qubo_to_ising_hamiltonian, parameter_shift_gradient
+
+def hardware_efficient_ansatz(qubits: List[cirq.Qid]) -> Tuple[cirq.Circuit, Tuple[sympy.Symbol, ...]]:
+    """Builds the Ry/Rz + CZ-ladder ansatz once, with one symbolic angle per rotation."""
+    num_qubits = len(qubits)
+    symbols = sympy.symbols(f'p0:{2*num_qubits}')
+    param_circuit = cirq.Circuit()
+    for i in range(num_qubits):
+        param_circuit.append(cirq.Ry(rads=symbols[2*i])(qubits[i]))
+        param_circuit.append(cirq.Rz(rads=symbols[2*i+1])(qubits[i]))
+    for i in range(num_qubits - 1):
+        param_circuit.append(cirq.CZ(qubits[i], qubits[i+1]))
+    return param_circuit, symbols
+
+def _vqe_restart(
+    pauli_terms: List[cirq.PauliString],
+    ising_offset: float,
+    qubits: List[cirq.Qid],
+    max_iter: int,
+    seed: int
+) -> Tuple[float, np.ndarray, Dict]:
+    """
+    One VQE optimization from a seeded random start, returning (fun, params, history).
+
+    Module-level so that run_restarts can ship it to worker processes; the
+    Hamiltonian travels as its Pauli terms because a PauliSum cannot be pickled.
+    """
+    hamiltonian = cirq.PauliSum.from_pauli_strings(pauli_terms)
+    param_circuit, symbols = hardware_efficient_ansatz(qubits)
+    simulator = SHARED_SIMULATOR
+    history = {"energies": [], "params": []}
+
+    def expectation(params):
+        values = simulator.simulate_expectation_values(
+            param_circuit, hamiltonian, param_resolver=cirq.ParamResolver(dict(zip(symbols, params)))
+        )
+        return np.real(values[0])
+
+    def cost_function(params):
+        energy = expectation(params)
+        history["energies"].append(energy + ising_offset)
+        history["params"].append(params)
+        return energy
+
+    rng = np.random.default_rng(seed)
+    initial_params = rng.uniform(0, 2 * np.pi, 2 * len(qubits))
+    # Every parameter is a single Ry/Rz angle, so the parameter-shift rule is exact
+    result = minimize(
+        cost_function, initial_params, method='L-BFGS-B',
+        jac=lambda p: parameter_shift_gradient(expectation, p),
+        options={'maxiter': max_iter}
+    )
+    return result.fun, result.x, history
 
 class VQESolver(BaseSolver):
     """Solves the problem using the Variational Quantum Eigensolver (VQE)."""
-    def __init__(self, max_iter: int = 150):
+    def __init__(self, max_iter: int = 150, restarts: int = 1):
         self.max_iter = max_iter
+        self.restarts = restarts
 
-    def solve(self, qubo: Dict, offset: float, var_list: List[str]) -> Tuple[Dict[str, int], Dict[str, Any]]:
-        hamiltonian, ising_offset, qubits = qubo_to_ising_hamiltonian(qubo, offset, var_list)
+    def solve(self, model: QuboBundle, hamiltonian_bundle: Optional[Tuple] = None) -> Tuple[Dict[str, int], Dict[str, Any]]:
+        if hamiltonian_bundle is None:
+            hamiltonian_bundle = qubo_to_ising_hamiltonian(model)
+        hamiltonian, ising_offset, qubits = hamiltonian_bundle
         num_qubits = len(qubits)
-        
-        # Hardware-Efficient Ansatz
-        def ansatz(params):
-            circuit = cirq.Circuit()
-            for i in range(num_qubits):
-                circuit.append(cirq.Ry(rads=params[2*i])(qubits[i]))
-                circuit.append(cirq.Rz(rads=params[2*i+1])(qubits[i]))
-            for i in range(num_qubits - 1):
-                circuit.append(cirq.CZ(qubits[i], qubits[i+1]))
-            return circuit
-
-        simulator = cirq.Simulator()
-        history = {"energies": [], "params": []}
-
-        def cost_function(params):
-            circuit = ansatz(params)
-            expectation = simulator.simulate_expectation_values(circuit, hamiltonian)
-            energy = np.real(expectation[0])
-            history["energies"].append(energy + ising_offset)
-            history["params"].append(params)
-            return energy
-
-        initial_params = np.random.uniform(0, 2 * np.pi, 2 * num_qubits)
-        result = minimize(cost_function, initial_params, method='COBYLA', options={'maxiter': self.max_iter})
-
-        final_circuit = ansatz(result.x)
-        final_circuit.append(cirq.measure(*qubits, key='result'))
-        samples = simulator.run(final_circuit, repetitions=1000)
+
+        one_restart = partial(_vqe_restart, list(hamiltonian), ising_offset, qubits, self.max_iter)
+        outcomes = run_restarts(one_restart, self.restarts)
+        _, best_params, history = best_restart(outcomes)
+
+        # Hardware-Efficient Ansatz, measured at the best parameters found
+        param_circuit, symbols = hardware_efficient_ansatz(qubits)
+        measured_circuit = param_circuit + cirq.measure(*qubits, key='result')
+        resolver = cirq.ParamResolver(dict(zip(symbols, best_params)))
+        samples = SHARED_SIMULATOR.run(measured_circuit, param_resolver=resolver, repetitions=1000)
         counts = samples.histogram(key='result')
         most_common_outcome = counts.most_common(1)[0][0]
         solution_bitstring = f"{most_common_outcome:0{num_qubits}b}"
-        solution = {var: int(bit) for var, bit in zip(var_list, solution_bitstring)}
+        solution = {var: int(bit) for var, bit in zip(model.var_list, solution_bitstring)}
 
         print(f"VQE found solution with energy: {min(history['energies']):.4f}")
         return solution, history
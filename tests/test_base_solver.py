@@ -0,0 +1,35 @@
+import operator
+import unittest
+from unittest import mock
+import numpy as np
+from src.solvers import base_solver
+from src.solvers.base_solver import best_restart, run_restarts
+
+class TestRestarts(unittest.TestCase):
+
+    def test_serial_restarts_in_seed_order(self):
+        """Test that serial restarts return one outcome per seed, in seed order."""
+        outcomes = run_restarts(lambda seed: seed * 10, num_restarts=4, parallel=False)
+        self.assertEqual(outcomes, [0, 10, 20, 30])
+
+    def test_parallel_restarts_in_seed_order(self):
+        """Test that pooled restarts return one outcome per seed, in seed order."""
+        # Pretend several CPUs are available so the pool is used even on a one-CPU machine
+        with mock.patch.object(base_solver, '_available_cpus', return_value=3):
+            outcomes = run_restarts(operator.neg, num_restarts=5, parallel=True)
+        self.assertEqual(outcomes, [0, -1, -2, -3, -4])
+
+    def test_best_restart_picks_lowest_fun(self):
+        """Test that the restart with the lowest objective value is selected."""
+        outcomes = [
+            (1.5, np.array([0.0]), {"energies": [1.5]}),
+            (-2.0, np.array([1.0]), {"energies": [-2.0]}),
+            (0.5, np.array([2.0]), {"energies": [0.5]}),
+        ]
+        fun, params, history = best_restart(outcomes)
+        self.assertEqual(fun, -2.0)
+        np.testing.assert_array_equal(params, [1.0])
+        self.assertEqual(history["energies"], [-2.0])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,23 @@
+import unittest
+from src.analysis.utils import get_bitstring_energy, make_qubo_bundle
+from src.solvers.classical_solver import ClassicalSolver
+
+class TestClassicalSolver(unittest.TestCase):
+
+    def test_exhaustive_solution_is_ground_state(self):
+        """Test that small problems return the minimum-energy bitstring."""
+        var_list = ['a', 'b', 'c']
+        qubo = {('a', 'a'): -1.0, ('a', 'b'): 2.0, ('b', 'c'): -3.0, ('c', 'c'): 0.5}
+        model = make_qubo_bundle(qubo, 1.5, var_list)
+        energies = [get_bitstring_energy(x, model) for x in range(2**len(var_list))]
+        best = min(range(len(energies)), key=energies.__getitem__)
+
+        solution, history = ClassicalSolver().solve(model)
+        solution_int = int(''.join(str(solution[var]) for var in var_list), 2)
+
+        self.assertEqual(solution_int, best)
+        self.assertAlmostEqual(get_bitstring_energy(solution_int, model), min(energies))
+        self.assertEqual(history, {})
+
+if __name__ == '__main__':
+    unittest.main()
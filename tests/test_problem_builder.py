@@ -1,16 +1,21 @@
+import itertools
 import unittest
-from src.problem_builder import define_problem_parameters, build_qubo_model
+import numpy as np
+from src.problem_builder import define_problem_parameters, build_qubo_model, _slack_coefficients
+from src.analysis.utils import qubo_to_matrix
 
 class TestProblemBuilder(unittest.TestCase):
 
     def test_qubo_creation(self):
         """Test that the QUBO is created without errors for a small problem."""
         params = define_problem_parameters(num_securities=4)
-        qubo, offset, var_list, _ = build_qubo_model(params)
+        model = build_qubo_model(params)
+        var_list = model.var_list
         
-        self.assertIsInstance(qubo, dict)
-        self.assertIsInstance(offset, float)
+        self.assertIsInstance(model.qubo, dict)
+        self.assertIsInstance(model.offset, float)
         self.assertGreater(len(var_list), 0)
+        self.assertEqual(len(model.coeffs), len(model.qubo))
         
         # Check that both asset and slack variables are present
         has_y_var = any(v.startswith('y[') for v in var_list)
@@ -18,5 +23,37 @@ class TestProblemBuilder(unittest.TestCase):
         self.assertTrue(has_y_var)
         self.assertTrue(has_s_var)
 
+    def test_qubo_matches_penalized_objective(self):
+        """Test every bitstring: x^T Q x + offset == rho*(a.y - t)^2 + P*(sum(y) + w.s - N)^2."""
+        params = define_problem_parameters(num_securities=5)
+        model = build_qubo_model(params)
+        Q = qubo_to_matrix(model)
+        num_securities = len(params['C'])
+        a = (params['beta_c_j'][:, 0] * params['A_c']).astype(float)
+        target = float(params['K_target_l_j'][0, 0])
+        rho = float(params['rho_j'][0])
+        w = np.array(_slack_coefficients(params['N']), dtype=float)
+        # Slack variables do not enter the objective, so its largest coefficient is in Q_matrix
+        penalty = 2 * np.max(np.abs(params['Q_matrix']))
+
+        for bits in itertools.product((0, 1), repeat=len(model.var_list)):
+            x = np.array(bits, dtype=float)
+            y, s = x[:num_securities], x[num_securities:]
+            objective = rho * (a @ y - target)**2
+            expected = objective + penalty * (y.sum() + w @ s - params['N'])**2
+            self.assertAlmostEqual(x @ Q @ x + model.offset, expected, places=6)
+            # The analyzer scores bond selections with the objective-only QUBO
+            self.assertAlmostEqual(y @ params['Q_matrix'] @ y + params['objective_offset'], objective, places=6)
+
+    def test_slack_coefficients_span_budget(self):
+        """Test that the slack weights' subset sums cover exactly 0..N."""
+        for N in (0, 1, 2, 4, 7):
+            coeffs = _slack_coefficients(N)
+            subset_sums = {
+                sum(c for c, bit in zip(coeffs, bits) if bit)
+                for bits in itertools.product((0, 1), repeat=len(coeffs))
+            }
+            self.assertEqual(subset_sums, set(range(N + 1)), f"N={N}")
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,76 @@
+import unittest
+from unittest import mock
+import numpy as np
+from src.analysis import utils
+from src.analysis.utils import all_bitstring_energies, compute_all_energies, get_bitstring_energy, make_qubo_bundle, parameter_shift_gradient, qubo_to_ising_hamiltonian, qubo_to_matrix
+
+class TestUtils(unittest.TestCase):
+
+    def setUp(self):
+        self.var_list = ['a', 'b', 'c']
+        self.qubo = {('a', 'a'): -1.0, ('b', 'a'): 2.0, ('b', 'c'): -3.0, ('c', 'c'): 0.5}
+        self.offset = 1.5
+        self.model = make_qubo_bundle(self.qubo, self.offset, self.var_list)
+
+    def reference_energy(self, x):
+        """Evaluates bitstring x by walking the QUBO dictionary directly."""
+        bits = dict(zip(self.var_list, (int(b) for b in f"{x:0{len(self.var_list)}b}")))
+        return self.offset + sum(c * bits[i] * bits[j] for (i, j), c in self.qubo.items())
+
+    def test_bitstring_energy(self):
+        """Test that the array-based bitstring energy matches the QUBO dictionary."""
+        for x in range(2**len(self.var_list)):
+            self.assertAlmostEqual(get_bitstring_energy(x, self.model), self.reference_energy(x))
+
+    def test_qubo_matrix_matches_bitstring_energy(self):
+        """Test that x^T Q x + offset reproduces the per-bitstring QUBO energy."""
+        Q = qubo_to_matrix(self.model)
+        num_vars = len(self.var_list)
+        for x in range(2**num_vars):
+            bits = np.array([int(b) for b in f"{x:0{num_vars}b}"], dtype=float)
+            self.assertAlmostEqual(self.offset + bits @ Q @ bits, self.reference_energy(x))
+
+    def test_ising_hamiltonian_matches_bitstring_energy(self):
+        """Test that the Ising diagonal plus offset reproduces the QUBO energies."""
+        hamiltonian, ising_offset, qubits = qubo_to_ising_hamiltonian(self.model)
+        diagonal = np.real(np.diag(hamiltonian.matrix(qubits)))
+        for x in range(2**len(self.var_list)):
+            self.assertAlmostEqual(diagonal[x] + ising_offset, self.reference_energy(x))
+
+    def test_all_bitstring_energies(self):
+        """Test that the enumerated energy spectrum matches per-bitstring energies."""
+        energies = all_bitstring_energies(qubo_to_matrix(self.model), self.offset)
+        expected = [self.reference_energy(x) for x in range(2**len(self.var_list))]
+        np.testing.assert_allclose(energies, expected)
+
+        energies = compute_all_energies(self.model)
+        np.testing.assert_allclose(energies, expected)
+
+    def test_all_bitstring_energies_spans_blocks(self):
+        """Test that block-wise enumeration stitches blocks, including a partial last one, in order."""
+        expected = [self.reference_energy(x) for x in range(2**len(self.var_list))]
+        with mock.patch.object(utils, 'ENUMERATION_BLOCK', 3):
+            energies = all_bitstring_energies(qubo_to_matrix(self.model), self.offset)
+        np.testing.assert_allclose(energies, expected)
+
+    def test_compute_all_energies_spans_chunks(self):
+        """Test the Gray-code walk on a dense QUBO large enough to split into several seeded chunks."""
+        rng = np.random.default_rng(0)
+        num_vars = 14
+        var_list = [f'x{i}' for i in range(num_vars)]
+        qubo = {
+            (var_list[i], var_list[j]): float(rng.normal())
+            for i in range(num_vars) for j in range(i, num_vars)
+        }
+        model = make_qubo_bundle(qubo, 0.25, var_list)
+        expected = all_bitstring_energies(qubo_to_matrix(model), model.offset)
+        np.testing.assert_allclose(compute_all_energies(model), expected, atol=1e-9)
+
+    def test_parameter_shift_gradient(self):
+        """Test that the shift rule is exact for single-rotation expectations like cos(theta)."""
+        params = np.array([0.3, -1.2, 2.5])
+        gradient = parameter_shift_gradient(lambda p: np.cos(p).sum(), params)
+        np.testing.assert_allclose(gradient, -np.sin(params))
+
+if __name__ == '__main__':
+    unittest.main()